@@ -13,15 +13,44 @@ To make wallpaper changes apply to ALL virtual desktops in Windows 11, install t
 Without this module, wallpaper changes only apply to the current virtual desktop.
 """
 
-import ctypes
+import atexit
 import os
-import json
-import random
+import subprocess
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
 
 DEFAULT_WALLPAPER_DIR = os.environ.get("WallpaperDir") or ""
 
+# Keep PowerShell windows from flashing up: no console at all, and the
+# process is told to start hidden (0 and None outside Windows)
+_CREATE_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+if hasattr(subprocess, "STARTUPINFO"):
+    _STARTUPINFO = subprocess.STARTUPINFO()
+    _STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    _STARTUPINFO.wShowWindow = 0  # SW_HIDE
+else:
+    _STARTUPINFO = None
+
+# Printed by the daemon's PowerShell host after each command
+_PS_HOST_DONE = "__WALLPAPER_ROTATOR_DONE__"
+
+
+@lru_cache(maxsize=None)
+def _json_codec() -> Tuple[Callable, Callable]:
+    """Return (dumps, loads) working on bytes, using orjson when installed."""
+    try:
+        import orjson
+
+        return orjson.dumps, orjson.loads
+    except ImportError:
+        import json
+
+        def dumps(obj) -> bytes:
+            return json.dumps(obj, separators=(",", ":")).encode()
+
+        return dumps, json.loads
+
 
 class WallpaperRotator:
     def __init__(self, wallpaper_folder: str, state_file: Optional[str] = None):
@@ -31,6 +60,7 @@ class WallpaperRotator:
             if state_file
             else self.wallpaper_folder / ".wallpaper_state.json"
         )
+        self.index_file = self.wallpaper_folder / ".wallpaper_index"
 
         # Supported image formats
         self.supported_formats = {
@@ -42,11 +72,50 @@ class WallpaperRotator:
             ".tiff",
             ".webp",
         }
+        # Lower- and upper-case suffixes so most names match without .lower()
+        self._lower_suffixes = tuple(self.supported_formats)
+        self._suffix_tuple = self._lower_suffixes + tuple(
+            fmt.upper() for fmt in self.supported_formats
+        )
+
+        # State writes are buffered in memory and flushed once at exit;
+        # _last_saved is the state known to be on disk
+        self._pending: Optional[dict] = None
+        self._dirty = False
+        self._last_saved: Optional[dict] = None
+        atexit.register(self._flush)
+
+        # Sorted image names, scanned at most once per invalidate(). The index
+        # file keeps them between runs, keyed by the folder's mtime.
+        # _known_mtime_ns is the folder mtime explained by the cached names
+        # plus our own writes since (None once something else touched it)
+        self._image_names_cache: Optional[List[str]] = None
+        self._known_mtime_ns: Optional[int] = None
+        self._index_mtime_ns: Optional[int] = None
+        self._index_dirty = False
+
+        # PowerShell executable, resolved on first launch (see _powershell_exe)
+        self._ps_exe: Optional[str] = None
+
+        # How long a "not supported" result is trusted before probing again
+        self._support_recheck_interval = 24 * 60 * 60
+
+        # Long-lived PowerShell process used by run_daemon(), and the queue
+        # its output lines are read into (None marks end of output)
+        self._ps_host: Optional[subprocess.Popen] = None
+        self._ps_host_lines = None
+
+        # Index header: 20-digit mtime, 10-digit name count, 8-hex-digit CRC
+        self._INDEX_HEADER_SIZE = 41
 
         # Windows API constants
         self.SPI_SETDESKWALLPAPER = 20
         self.SPIF_UPDATEINIFILE = 0x01
         self.SPIF_SENDCHANGE = 0x02
+        self.COINIT_APARTMENTTHREADED = 0x2
+        self.CLSCTX_ALL = 0x17
+        self.CLSID_DesktopWallpaper = "{C2CF3110-460E-4FC1-B9D0-8A1C0C9CC4BD}"
+        self.IID_IDesktopWallpaper = "{B92B56A9-8B55-4E14-9A89-0199BBB6F93B}"
 
         if not self.wallpaper_folder.exists():
             raise FileNotFoundError(
@@ -55,16 +124,182 @@ class WallpaperRotator:
 
     def get_image_files(self) -> List[Path]:
         """Get all supported image files from the wallpaper folder."""
-        image_files = []
-        for file_path in self.wallpaper_folder.iterdir():
-            if (
-                file_path.is_file()
-                and file_path.suffix.lower() in self.supported_formats
-            ):
-                image_files.append(file_path)
+        return [self.wallpaper_folder / name for name in self._get_image_names()]
+
+    def _get_image_names(self) -> List[str]:
+        """Get the sorted names of all supported image files.
+
+        Callers that only need one file build its Path themselves rather than
+        materialising a Path for every image in the folder.
+        """
+        if self._image_names_cache is not None:
+            return self._image_names_cache
+
+        # An unchanged folder mtime means no entries were added, removed or
+        # renamed, so the indexed list can be trusted without a scan
+        index = self._load_index()
+        self._index_mtime_ns = index[0] if index else None
+        self._known_mtime_ns = os.stat(self.wallpaper_folder).st_mtime_ns
+        if index and index[0] == self._known_mtime_ns:
+            self._image_names_cache = index[1]
+            self._index_dirty = False
+            return self._image_names_cache
+
+        image_names = []
+        with os.scandir(self.wallpaper_folder) as it:
+            for entry in it:
+                # Cheap name check first so non-images never cost a stat
+                name = entry.name
+                if not (
+                    name.endswith(self._suffix_tuple)
+                    or name.lower().endswith(self._lower_suffixes)
+                ):
+                    continue
+                if entry.is_file():
+                    image_names.append(name)
+
+        # Sort for consistent ordering (case-insensitive on Windows, matching
+        # how Path objects compare there)
+        image_names.sort(key=str.lower if os.name == "nt" else None)
+        self._image_names_cache = image_names
+        # The body only needs rewriting if the names differ from the index
+        self._index_dirty = not index or image_names != index[1]
+        return image_names
+
+    def invalidate(self) -> None:
+        """Drop the cached image list so the next lookup rescans the folder."""
+        self._image_names_cache = None
+
+    @staticmethod
+    def _names_checksum(body: bytes) -> int:
+        """CRC-32 of newline-joined image names, as stored in the index."""
+        import zlib
+
+        return zlib.crc32(body)
+
+    def _folder_mtime_ns(self) -> Optional[int]:
+        """Return the wallpaper folder's mtime, or None if it can't be read."""
+        try:
+            return os.stat(self.wallpaper_folder).st_mtime_ns
+        except OSError:
+            return None
 
-        # Sort for consistent ordering
-        return sorted(image_files)
+    def _replace_file(self, path: Path, data: bytes, sync: bool = False) -> None:
+        """Atomically replace path with data via a temp file and os.replace.
+
+        Creating the temp file and renaming it bump the folder mtime when path
+        is inside the wallpaper folder. _known_mtime_ns follows those bumps,
+        and is cleared if anything else changed the folder in between, so the
+        index is only ever stamped with an mtime our own writes explain.
+        """
+        tmp_file = str(path) + ".tmp"
+        if self._folder_mtime_ns() != self._known_mtime_ns:
+            self._known_mtime_ns = None
+
+        with open(tmp_file, "wb") as f:
+            if self._known_mtime_ns is not None:
+                self._known_mtime_ns = self._folder_mtime_ns()
+            f.write(data)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+
+        if self._folder_mtime_ns() != self._known_mtime_ns:
+            self._known_mtime_ns = None
+        os.replace(tmp_file, path)
+        if self._known_mtime_ns is not None:
+            self._known_mtime_ns = self._folder_mtime_ns()
+
+    def _load_index(self) -> Optional[Tuple[int, List[str]]]:
+        """Load the (folder mtime, sorted names) index from a previous run.
+
+        The file is a fixed-width header (folder mtime, name count, CRC-32 of
+        the body) followed by one name per line, already sorted, so loading it
+        needs neither parsing nor sorting. An index whose header doesn't match
+        its body is ignored, which forces a rescan.
+        """
+        try:
+            data = self.index_file.read_bytes()
+            header = data[: self._INDEX_HEADER_SIZE]
+            body = data[self._INDEX_HEADER_SIZE :]
+            if len(header) != self._INDEX_HEADER_SIZE or header[-1:] != b"\n":
+                return None
+            mtime_ns, count, crc = header.split()
+            if self._names_checksum(body) != int(crc, 16):
+                return None
+            names = body.decode("utf-8").split("\n") if body else []
+            if len(names) != int(count):
+                return None
+            return int(mtime_ns), names
+        except (ValueError, IOError):
+            return None
+
+    def _write_index(self) -> None:
+        """Write the image index atomically, then stamp it."""
+        try:
+            body = "\n".join(self._image_names_cache).encode("utf-8")
+            header = b"%020d %010d %08x\n" % (
+                0,
+                len(self._image_names_cache),
+                self._names_checksum(body),
+            )
+            self._replace_file(self.index_file, header + body)
+        except (IOError, OSError, UnicodeError) as e:
+            print(f"Warning: Could not save index file: {e}")
+            return
+
+        # Written with a zero mtime, so it is only trusted once stamped
+        self._index_mtime_ns = 0
+        self._stamp_index()
+
+    def _stamp_index(self) -> None:
+        """Record the folder mtime our own writes explain in the index header."""
+        folder_mtime_ns = self._known_mtime_ns
+        if folder_mtime_ns is None or self._folder_mtime_ns() != folder_mtime_ns:
+            # Something else changed the folder: leave the index unstamped so
+            # the next run rescans
+            return
+
+        try:
+            # Only the fixed-width mtime field is rewritten, in place, so the
+            # folder mtime is unaffected and the body is never touched
+            with open(self.index_file, "r+b") as f:
+                f.write(b"%020d" % folder_mtime_ns)
+        except (IOError, OSError) as e:
+            print(f"Warning: Could not save index file: {e}")
+            return
+
+        self._index_mtime_ns = folder_mtime_ns
+
+    def _delete_index(self) -> None:
+        """Remove the image index so the next run rescans the folder."""
+        self.invalidate()
+        self._index_dirty = False
+        try:
+            self.index_file.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Warning: Could not remove index file: {e}")
+
+    def _flush(self) -> None:
+        """Write buffered state, then refresh the image index if needed."""
+        # The state file usually lives in the wallpaper folder and replacing
+        # it bumps the folder mtime, so it must be written before the index
+        self._flush_state()
+
+        # Only touch the index if nothing but our own writes changed the
+        # folder since it was scanned or validated
+        if self._image_names_cache is None or self._known_mtime_ns is None:
+            return
+        if self._index_dirty:
+            self._index_dirty = False
+            self._write_index()
+        elif (
+            self._index_mtime_ns is not None
+            and self._known_mtime_ns != self._index_mtime_ns
+        ):
+            self._stamp_index()
 
     def load_state(self) -> dict:
         """Load the current state from the state file."""
@@ -72,90 +307,283 @@ class WallpaperRotator:
             "current_index": -1,
             "last_wallpaper": None,
             "image_count": 0,
+            "names_crc": None,  # checksum of the image names at last rotation
             "order": "sequential",  # or "random"
+            "vd_supported": None,  # cached result of the VirtualDesktop probe
+            "vd_checked_at": None,  # when a negative result was cached
+            "ps_module_path": None,  # where VirtualDesktop was last found
+            "ps_exe": None,  # PowerShell executable that found it
         }
 
-        if not self.state_file.exists():
-            return default_state
+        if self._pending is not None:
+            return dict(self._pending)
 
+        # A missing file shows up as an error from the read itself, which
+        # saves a separate exists() stat
+        _, loads = _json_codec()
         try:
-            with open(self.state_file, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
+            state = loads(self.state_file.read_bytes())
+        except (ValueError, IOError):
             return default_state
 
+        self._last_saved = dict(state)
+        return state
+
     def save_state(self, state: dict) -> None:
-        """Save the current state to the state file."""
+        """Save the current state; the file is written by _flush_state()."""
+        self._pending = dict(state)
+        self._dirty = True
+
+    def _flush_state(self) -> None:
+        """Write any buffered state to the state file."""
+        if not self._dirty:
+            return
+        self._dirty = False
+
+        state = self._pending
+        if state == self._last_saved:
+            return
+
+        dumps, _ = _json_codec()
+
+        # Write to a temp file and swap it in so a crash never leaves a
+        # truncated state file behind
         try:
-            with open(self.state_file, "w") as f:
-                json.dump(state, f, indent=2)
+            self._replace_file(self.state_file, dumps(state), sync=True)
         except IOError as e:
             print(f"Warning: Could not save state file: {e}")
+            return
+
+        self._last_saved = dict(state)
 
     def set_wallpaper(self, image_path: Path) -> bool:
-        """Set the desktop wallpaper on all virtual desktops using PowerShell."""
+        """Set the desktop wallpaper, then propagate it to all virtual desktops."""
         try:
-            # Convert to absolute path string
-            wallpaper_path = str(image_path.resolve())
+            # Convert to absolute path string (no symlink resolution needed)
+            wallpaper_path = os.path.abspath(str(image_path))
+
+            # Change the current desktop straight away via the Win32 API,
+            # which is far quicker than starting PowerShell
+            success = self._set_wallpaper_current_desktop(wallpaper_path)
+
+            # In daemon mode the already-running PowerShell host does the rest
+            if self._ps_host is not None:
+                host_result = self._set_wallpaper_via_host(wallpaper_path)
+                if host_result is not None:
+                    # The host is still healthy even if this image failed
+                    if not host_result:
+                        print("Set-AllDesktopWallpapers failed for this image.")
+                    return host_result or success
+                print("PowerShell host failed, falling back to a new process...")
+                self._stop_powershell_host()
+
+            # Then use the PowerShell VirtualDesktop module for the other
+            # desktops. Once it is known to work there is no need to wait for
+            # it; while support is unknown, or the module's path needs
+            # (re)discovering, run it synchronously so the result gets cached
+            vd_supported = self._cached_support()
+            if vd_supported and not self._has_valid_module_path():
+                vd_supported = None
+            if vd_supported:
+                self._set_wallpaper_all_desktops_powershell(wallpaper_path, wait=False)
+            elif vd_supported is None:
+                if self._set_wallpaper_all_desktops_powershell(wallpaper_path):
+                    return True
+
+            return success
+        except Exception as e:
+            print(f"Error setting wallpaper: {e}")
+            return False
 
-            # First try PowerShell VirtualDesktop module for all desktops
-            if self._set_wallpaper_all_desktops_powershell(wallpaper_path):
-                return True
+    def _set_wallpaper_current_desktop(self, wallpaper_path: str) -> bool:
+        """Set wallpaper on the current virtual desktop only."""
+        try:
+            import ctypes
 
-            # Fallback to traditional API (current desktop only)
-            print("PowerShell method failed, falling back to single desktop method...")
             result = ctypes.windll.user32.SystemParametersInfoW(
                 self.SPI_SETDESKWALLPAPER,
                 0,
                 wallpaper_path,
                 self.SPIF_UPDATEINIFILE | self.SPIF_SENDCHANGE,
             )
+            if result != 0:
+                return True
+        except Exception as e:
+            print(f"SystemParametersInfo error: {e}")
 
-            return result != 0
+        # Fallback to the COM API
+        return self._set_wallpaper_com(wallpaper_path)
+
+    def _set_wallpaper_com(self, wallpaper_path: str) -> bool:
+        """Set wallpaper on every monitor via the IDesktopWallpaper COM interface."""
+        try:
+            import ctypes
+
+            ole32 = ctypes.OleDLL("ole32")
+            clsid = (ctypes.c_byte * 16)()
+            iid = (ctypes.c_byte * 16)()
+            ole32.CLSIDFromString(self.CLSID_DesktopWallpaper, ctypes.byref(clsid))
+            ole32.IIDFromString(self.IID_IDesktopWallpaper, ctypes.byref(iid))
+
+            ole32.CoInitializeEx(None, self.COINIT_APARTMENTTHREADED)
+            try:
+                wallpaper = ctypes.c_void_p()
+                ole32.CoCreateInstance(
+                    ctypes.byref(clsid),
+                    None,
+                    self.CLSCTX_ALL,
+                    ctypes.byref(iid),
+                    ctypes.byref(wallpaper),
+                )
+                vtable = ctypes.cast(
+                    wallpaper, ctypes.POINTER(ctypes.POINTER(ctypes.c_void_p))
+                ).contents
+                # IUnknown::Release is slot 2, IDesktopWallpaper::SetWallpaper slot 3
+                release = ctypes.WINFUNCTYPE(ctypes.c_ulong, ctypes.c_void_p)(
+                    vtable[2]
+                )
+                set_wallpaper = ctypes.WINFUNCTYPE(
+                    ctypes.HRESULT, ctypes.c_void_p, ctypes.c_wchar_p, ctypes.c_wchar_p
+                )(vtable[3])
+                try:
+                    # A NULL monitor ID applies the wallpaper to all monitors
+                    set_wallpaper(wallpaper, None, wallpaper_path)
+                finally:
+                    release(wallpaper)
+            finally:
+                ole32.CoUninitialize()
+
+            return True
         except Exception as e:
-            print(f"Error setting wallpaper: {e}")
+            print(f"COM wallpaper error: {e}")
             return False
 
-    def _set_wallpaper_all_desktops_powershell(self, wallpaper_path: str) -> bool:
-        """Set wallpaper on all virtual desktops using PowerShell VirtualDesktop module."""
+    def _powershell_exe(self) -> str:
+        """Return the PowerShell executable to launch, resolving it on first use.
+
+        The executable that last found the VirtualDesktop module is cached in
+        the state; otherwise PowerShell 7 is preferred for its faster startup.
+        """
+        if self._ps_exe is None:
+            exe = self.load_state().get("ps_exe")
+            if not exe:
+                import shutil
+
+                exe = "pwsh" if shutil.which("pwsh") else "powershell"
+            self._ps_exe = exe
+        return self._ps_exe
+
+    def _record_ps_exe(self, exe: str) -> None:
+        """Cache the PowerShell executable that found the module."""
+        self._ps_exe = exe
+        state = self.load_state()
+        if state.get("ps_exe") != exe:
+            state["ps_exe"] = exe
+            self.save_state(state)
+
+    def _powershell_args(
+        self, ps_command: str, exe: Optional[str] = None
+    ) -> List[str]:
+        """Build the command line for running a PowerShell script."""
+        return [
+            exe or self._powershell_exe(),
+            "-NoProfile",
+            "-NonInteractive",
+            "-Command",
+            ps_command,
+        ]
+
+    def _run_powershell(
+        self, ps_command: str, missing_token: str
+    ) -> subprocess.CompletedProcess:
+        """Run a PowerShell script and wait for its output.
+
+        pwsh doesn't search Windows PowerShell's module folders (such as
+        Documents\\WindowsPowerShell\\Modules, where Install-Module puts
+        CurrentUser installs), so if the script prints missing_token there it
+        is retried in Windows PowerShell before the module counts as missing.
+        """
+        exe = self._powershell_exe()
+        result = None
         try:
-            import subprocess
+            result = subprocess.run(
+                self._powershell_args(ps_command, exe),
+                capture_output=True,
+                text=True,
+                timeout=30,
+                creationflags=_CREATE_NO_WINDOW,
+                startupinfo=_STARTUPINFO,
+            )
+        except FileNotFoundError:
+            if exe == "powershell":
+                raise
 
+        if exe != "powershell" and (result is None or missing_token in result.stdout):
+            exe = "powershell"
+            self._ps_exe = exe
+            result = subprocess.run(
+                self._powershell_args(ps_command, exe),
+                capture_output=True,
+                text=True,
+                timeout=30,
+                creationflags=_CREATE_NO_WINDOW,
+                startupinfo=_STARTUPINFO,
+            )
+
+        if result.returncode == 0 and missing_token not in result.stdout:
+            self._record_ps_exe(exe)
+        return result
+
+    def _set_wallpaper_all_desktops_powershell(
+        self, wallpaper_path: str, wait: bool = True
+    ) -> bool:
+        """Set wallpaper on all virtual desktops using PowerShell VirtualDesktop module.
+
+        With wait=False PowerShell is started in the background and its
+        outcome is not checked.
+        """
+        try:
             # PowerShell command to set wallpaper on all virtual desktops
             ps_command = f'''
             # Import VirtualDesktop module if available
-            if (Get-Module -ListAvailable -Name VirtualDesktop) {{
-                Import-Module VirtualDesktop -ErrorAction SilentlyContinue
-                if (Get-Command Set-AllDesktopWallpapers -ErrorAction SilentlyContinue) {{
-                    Set-AllDesktopWallpapers -Path "{wallpaper_path}"
-                    Write-Output "SUCCESS"
-                }} else {{
-                    Write-Output "COMMAND_NOT_FOUND"
-                }}
-            }} else {{
+            {self._import_module_script()}
+            if (-not (Get-Module VirtualDesktop)) {{
                 Write-Output "MODULE_NOT_FOUND"
+            }} elseif (Get-Command Set-AllDesktopWallpapers -ErrorAction SilentlyContinue) {{
+                Set-AllDesktopWallpapers -Path "{wallpaper_path}"
+                Write-Output "SUCCESS"
+            }} else {{
+                Write-Output "COMMAND_NOT_FOUND"
             }}
             '''
 
+            if not wait:
+                subprocess.Popen(
+                    self._powershell_args(ps_command),
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    creationflags=_CREATE_NO_WINDOW,
+                    startupinfo=_STARTUPINFO,
+                )
+                return True
+
             # Execute PowerShell command hidden (no window flash)
-            result = subprocess.run(
-                ["powershell", "-WindowStyle", "Hidden", "-Command", ps_command],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                creationflags=subprocess.CREATE_NO_WINDOW
-                if hasattr(subprocess, "CREATE_NO_WINDOW")
-                else 0,
-            )
+            result = self._run_powershell(ps_command, "MODULE_NOT_FOUND")
 
+            # The script probes for the module itself, so its output doubles
+            # as the multi-desktop support check
+            self._record_module_path(result.stdout)
             if result.returncode == 0 and "SUCCESS" in result.stdout:
+                self._record_support(True)
                 return True
             elif "MODULE_NOT_FOUND" in result.stdout:
+                self._record_support(False)
                 print(
                     "VirtualDesktop PowerShell module not installed. Install with: Install-Module VirtualDesktop"
                 )
                 return False
             elif "COMMAND_NOT_FOUND" in result.stdout:
+                self._record_support(False)
                 print(
                     "Set-AllDesktopWallpapers command not found. Update VirtualDesktop module."
                 )
@@ -171,42 +599,237 @@ class WallpaperRotator:
             print(f"PowerShell execution error: {e}")
             return False
 
+    def _start_powershell_host(self, exe: Optional[str] = None) -> bool:
+        """Start a persistent PowerShell process with VirtualDesktop loaded.
+
+        Falls back to Windows PowerShell if pwsh can't start or can't find
+        the module (see _run_powershell).
+        """
+        import queue
+        import threading
+
+        exe = exe or self._powershell_exe()
+        try:
+            self._ps_host = subprocess.Popen(
+                [
+                    exe,
+                    "-NoLogo",
+                    "-NoProfile",
+                    "-NonInteractive",
+                    "-Command",
+                    "-",
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                creationflags=_CREATE_NO_WINDOW,
+                startupinfo=_STARTUPINFO,
+            )
+        except OSError as e:
+            if exe != "powershell":
+                return self._start_powershell_host("powershell")
+            print(f"PowerShell execution error: {e}")
+            return False
+
+        # Read output on a background thread so commands can time out
+        self._ps_host_lines = queue.Queue()
+        threading.Thread(
+            target=self._pump_host_output,
+            args=(self._ps_host.stdout, self._ps_host_lines),
+            daemon=True,
+        ).start()
+
+        # Match the console encodings to the UTF-8 pipes, so non-ASCII
+        # wallpaper paths survive the round trip
+        if (
+            self._run_in_host(
+                "[Console]::InputEncoding = [Console]::OutputEncoding = "
+                "[System.Text.UTF8Encoding]::new($false)"
+            )
+            is None
+        ):
+            self._stop_powershell_host()
+            return False
+
+        output = self._run_in_host(
+            f"{self._import_module_script()}; "
+            "if (Get-Command Set-AllDesktopWallpapers -ErrorAction SilentlyContinue) "
+            "{ 'SUCCESS' } else { 'COMMAND_NOT_FOUND' }"
+        )
+        if output is None:
+            self._stop_powershell_host()
+            return False
+
+        self._record_module_path("\n".join(output))
+
+        supported = "SUCCESS" in output
+        if not supported and exe != "powershell":
+            self._stop_powershell_host()
+            return self._start_powershell_host("powershell")
+
+        self._record_support(supported)
+        if supported:
+            self._record_ps_exe(exe)
+        else:
+            self._stop_powershell_host()
+        return supported
+
+    @staticmethod
+    def _pump_host_output(stream, lines) -> None:
+        """Copy the PowerShell host's output into a queue, line by line."""
+        try:
+            for line in stream:
+                lines.put(line)
+        except (OSError, ValueError):
+            pass
+        lines.put(None)
+
+    def _run_in_host(
+        self, ps_command: str, timeout: float = 30
+    ) -> Optional[List[str]]:
+        """Run a single-line command in the PowerShell host and return its output.
+
+        Returns None if the host has exited, its pipes are broken, or it
+        doesn't finish within timeout seconds.
+        """
+        import queue
+        import time
+
+        host = self._ps_host
+        if host is None:
+            return None
+
+        try:
+            host.stdin.write(f"{ps_command}; Write-Output '{_PS_HOST_DONE}'\n")
+            host.stdin.flush()
+        except (OSError, ValueError):
+            return None
+
+        deadline = time.monotonic() + timeout
+        output = []
+        while True:
+            try:
+                line = self._ps_host_lines.get(
+                    timeout=max(deadline - time.monotonic(), 0)
+                )
+            except queue.Empty:
+                print("PowerShell host timed out")
+                return None
+            if line is None:
+                return None
+            line = line.strip()
+            if line == _PS_HOST_DONE:
+                return output
+            output.append(line)
+
+    def _set_wallpaper_via_host(self, wallpaper_path: str) -> Optional[bool]:
+        """Set wallpaper on all virtual desktops through the PowerShell host.
+
+        Returns None if the host itself failed, as opposed to the command.
+        """
+        escaped_path = wallpaper_path.replace("'", "''")
+        output = self._run_in_host(
+            f"try {{ Set-AllDesktopWallpapers -Path '{escaped_path}' "
+            "-ErrorAction Stop; 'SUCCESS' } catch { 'ERROR' }"
+        )
+        if output is None:
+            return None
+        return "SUCCESS" in output
+
+    def _stop_powershell_host(self) -> None:
+        """Shut down the PowerShell host, if running."""
+        host, self._ps_host = self._ps_host, None
+        self._ps_host_lines = None
+        if host is None:
+            return
+
+        try:
+            # PowerShell exits once its command stream ends
+            host.stdin.close()
+            host.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            host.kill()
+
+    def run_daemon(
+        self, order: str = "sequential", interval: float = 300, verbose: bool = True
+    ) -> None:
+        """Rotate the wallpaper every interval seconds until interrupted.
+
+        One PowerShell process is kept alive for the whole session, so each
+        change skips PowerShell's startup cost.
+        """
+        import time
+
+        atexit.register(self._stop_powershell_host)
+        if self._cached_support() is not False:
+            self._start_powershell_host()
+
+        try:
+            while True:
+                # Pick up folder changes and external state edits each round
+                try:
+                    self.invalidate()
+                    self.rotate_wallpaper(order, verbose=verbose)
+                    self._flush()
+                    self._pending = None
+                except OSError as e:
+                    # e.g. a network or USB folder being briefly unavailable
+                    print(f"Error during rotation: {e}")
+
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._stop_powershell_host()
+
     def get_next_wallpaper(self, order: str = "sequential") -> Optional[Path]:
         """Get the next wallpaper in the rotation."""
-        image_files = self.get_image_files()
+        image_names = self._get_image_names()
 
-        if not image_files:
+        if not image_names:
             print("No image files found in wallpaper folder.")
             return None
 
         state = self.load_state()
         current_index = state.get("current_index", -1)
 
-        # Check if the folder contents have changed
-        if len(image_files) != state.get("image_count", 0):
-            print(f"Folder contents changed. Found {len(image_files)} images.")
+        # Check if the folder contents have changed since the last rotation.
+        # The checksum also catches renames that keep the count the same
+        names_crc = self._names_checksum("\n".join(image_names).encode("utf-8"))
+        stored_crc = state.get("names_crc")
+        if len(image_names) != state.get("image_count", 0) or (
+            stored_crc is not None and stored_crc != names_crc
+        ):
+            print(f"Folder contents changed. Found {len(image_names)} images.")
             current_index = -1  # Reset to start from beginning
 
         if order == "random":
             # Random selection (avoid repeating the same image immediately)
-            if len(image_files) > 1:
-                available_indices = [
-                    i for i in range(len(image_files)) if i != current_index
-                ]
-                next_index = random.choice(available_indices)
+            import random
+
+            count = len(image_names)
+            if count > 1 and 0 <= current_index < count:
+                # Draw from the other count - 1 slots, skipping over current
+                next_index = random.randrange(count - 1)
+                if next_index >= current_index:
+                    next_index += 1
             else:
-                next_index = 0
+                next_index = random.randrange(count)
         else:
             # Sequential order
-            next_index = (current_index + 1) % len(image_files)
+            next_index = (current_index + 1) % len(image_names)
 
         # Update state
-        next_wallpaper = image_files[next_index]
+        next_wallpaper = self.wallpaper_folder / image_names[next_index]
         state.update(
             {
                 "current_index": next_index,
                 "last_wallpaper": str(next_wallpaper),
-                "image_count": len(image_files),
+                "image_count": len(image_names),
+                "names_crc": names_crc,
                 "order": order,
             }
         )
@@ -247,52 +870,150 @@ class WallpaperRotator:
         state = self.load_state()
         state["current_index"] = -1
         self.save_state(state)
+        self._delete_index()
         print("Rotation reset to start from beginning.")
 
-    def check_virtualdesktop_support(self) -> bool:
-        """Check if VirtualDesktop module and commands are available."""
+    def check_virtualdesktop_support(self, refresh: bool = False) -> bool:
+        """Check if VirtualDesktop module and commands are available.
+
+        The result is cached in the state file so PowerShell is only probed
+        once; pass refresh=True (or use clear_support_cache()) to force a
+        fresh check, which also refreshes the cached module path.
+        """
+        cached = None if refresh else self._cached_support()
+        if cached is not None:
+            return cached
+
+        if refresh:
+            state = self.load_state()
+            state["ps_module_path"] = None
+            state["ps_exe"] = None
+            self.save_state(state)
+            self._ps_exe = None
+
         try:
-            import subprocess
-
-            ps_command = """
-            if (Get-Module -ListAvailable -Name VirtualDesktop) {
-                Import-Module VirtualDesktop -ErrorAction SilentlyContinue
-                if (Get-Command Set-AllDesktopWallpapers -ErrorAction SilentlyContinue) {
-                    Write-Output "SUPPORTED"
-                } else {
-                    Write-Output "COMMAND_MISSING"
-                }
-            } else {
+            ps_command = f"""
+            {self._import_module_script()}
+            if (-not (Get-Module VirtualDesktop)) {{
                 Write-Output "MODULE_MISSING"
-            }
+            }} elseif (Get-Command Set-AllDesktopWallpapers -ErrorAction SilentlyContinue) {{
+                Write-Output "SUPPORTED"
+            }} else {{
+                Write-Output "COMMAND_MISSING"
+            }}
             """
 
-            result = subprocess.run(
-                ["powershell", "-WindowStyle", "Hidden", "-Command", ps_command],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                creationflags=subprocess.CREATE_NO_WINDOW
-                if hasattr(subprocess, "CREATE_NO_WINDOW")
-                else 0,
-            )
-
-            return result.returncode == 0 and "SUPPORTED" in result.stdout
+            result = self._run_powershell(ps_command, "MODULE_MISSING")
 
         except Exception:
             return False
 
+        # Only cache a definite answer; a failed or garbled run says nothing
+        # about whether the module is installed
+        if result.returncode == 0 and "SUPPORTED" in result.stdout:
+            supported = True
+        elif "MODULE_MISSING" in result.stdout or "COMMAND_MISSING" in result.stdout:
+            supported = False
+        else:
+            return False
+
+        self._record_support(supported)
+        self._record_module_path(result.stdout)
+        return supported
+
+    def _import_module_script(self) -> str:
+        """Single-line PowerShell that imports the VirtualDesktop module.
+
+        Searching PSModulePath with Get-Module -ListAvailable is the slowest
+        part of the script, so once the module has been found its path is
+        cached and imported directly. The search still runs if that import
+        fails, and prints the path it finds as MODULE_PATH=<path>.
+        """
+        find_module = (
+            "$mod = Get-Module -ListAvailable -Name VirtualDesktop "
+            "| Sort-Object Version -Descending | Select-Object -First 1; "
+            "if ($mod) { Import-Module $mod.Path -ErrorAction SilentlyContinue; "
+            'Write-Output "MODULE_PATH=$($mod.Path)" }'
+        )
+
+        module_path = self.load_state().get("ps_module_path")
+        if not module_path:
+            return find_module
+
+        escaped_path = module_path.replace("'", "''")
+        return (
+            f"Import-Module '{escaped_path}' -ErrorAction SilentlyContinue; "
+            f"if (-not (Get-Module VirtualDesktop)) {{ {find_module} }}"
+        )
+
+    def _has_valid_module_path(self) -> bool:
+        """Check the cached module path still exists, forgetting it if not."""
+        state = self.load_state()
+        module_path = state.get("ps_module_path")
+        if not module_path:
+            return False
+        if os.path.exists(module_path):
+            return True
+
+        state["ps_module_path"] = None
+        self.save_state(state)
+        return False
+
+    def _record_module_path(self, ps_output: str) -> None:
+        """Cache the VirtualDesktop module path reported by PowerShell."""
+        for line in ps_output.splitlines():
+            if line.startswith("MODULE_PATH="):
+                state = self.load_state()
+                state["ps_module_path"] = line[len("MODULE_PATH=") :].strip()
+                self.save_state(state)
+                return
+
+    def _cached_support(self) -> Optional[bool]:
+        """Return the cached support result, or None if it should be probed.
+
+        A negative result expires after a while so that installing the
+        module is eventually noticed without --recheck-support.
+        """
+        import time
+
+        state = self.load_state()
+        supported = state.get("vd_supported")
+        if supported is False:
+            checked_at = state.get("vd_checked_at") or 0
+            if time.time() - checked_at > self._support_recheck_interval:
+                return None
+        return supported
+
+    def _record_support(self, supported: bool) -> None:
+        """Cache a support result observed while setting the wallpaper."""
+        import time
+
+        state = self.load_state()
+        state["vd_supported"] = supported
+        state["vd_checked_at"] = None if supported else time.time()
+        self.save_state(state)
+
+    def clear_support_cache(self) -> None:
+        """Forget the cached multi-desktop support result and module path."""
+        state = self.load_state()
+        state["vd_supported"] = None
+        state["vd_checked_at"] = None
+        state["ps_module_path"] = None
+        state["ps_exe"] = None
+        self.save_state(state)
+        self._ps_exe = None
+
     def get_status(self) -> dict:
         """Get current status information."""
-        image_files = self.get_image_files()
+        image_names = self._get_image_names()
         state = self.load_state()
 
         current_wallpaper = None
-        if 0 <= state.get("current_index", -1) < len(image_files):
-            current_wallpaper = image_files[state["current_index"]].name
+        if 0 <= state.get("current_index", -1) < len(image_names):
+            current_wallpaper = image_names[state["current_index"]]
 
         return {
-            "total_images": len(image_files),
+            "total_images": len(image_names),
             "current_index": state.get("current_index", -1),
             "current_wallpaper": current_wallpaper,
             "order": state.get("order", "sequential"),
@@ -334,17 +1055,40 @@ def main():
         action="store_true",
         help="Check if multi-desktop support is available",
     )
+    parser.add_argument(
+        "--recheck-support",
+        action="store_true",
+        help="Discard the cached multi-desktop support result and probe again",
+    )
+    parser.add_argument(
+        "--daemon",
+        "-d",
+        action="store_true",
+        help="Keep running and rotate every --interval seconds",
+    )
+    parser.add_argument(
+        "--interval",
+        "-i",
+        type=float,
+        default=300,
+        help="Seconds between rotations in daemon mode",
+    )
     parser.add_argument(
         "--quiet", "-q", action="store_true", help="Quiet mode - minimal output"
     )
 
     args = parser.parse_args()
+    if args.daemon and args.interval <= 0:
+        parser.error("--interval must be greater than 0")
 
     try:
         rotator = WallpaperRotator(args.folder)
 
+        if args.recheck_support:
+            rotator.clear_support_cache()
+
         if args.check_support:
-            if rotator.check_virtualdesktop_support():
+            if rotator.check_virtualdesktop_support(refresh=True):
                 print("✓ Multi-desktop support is available")
             else:
                 print("✗ Multi-desktop support not available")
@@ -373,21 +1117,27 @@ def main():
             rotator.reset_rotation()
             return
 
-        # Check support and warn user if needed
-        if not args.quiet and not rotator.check_virtualdesktop_support():
-            print("⚠️  WARNING: Multi-desktop support not available.")
-            print("   Wallpaper will only change on the current virtual desktop.")
-            print(
-                "   Run 'python wallpaper_rotator.py --setup' to enable support for all desktops."
-            )
-            print()
-
         # Set order if specified
         rotator.set_order(args.order)
 
+        if args.daemon:
+            rotator.run_daemon(args.order, args.interval, verbose=not args.quiet)
+            return
+
         # Rotate wallpaper
         success = rotator.rotate_wallpaper(args.order, verbose=not args.quiet)
 
+        # Setting the wallpaper also probes for support, so warn afterwards
+        # instead of launching a separate PowerShell check up front
+        if not args.quiet and rotator.load_state().get("vd_supported") is False:
+            print()
+            print("⚠️  WARNING: Multi-desktop support not available.")
+            print("   Wallpaper will only change on the current virtual desktop.")
+            print(
+                "   Install the VirtualDesktop module (see --setup), then run with"
+                " --recheck-support to enable it straight away."
+            )
+
         if not success:
             exit(1)
 